@@ -1,9 +1,11 @@
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Set
 
 import requests
 from requests.exceptions import JSONDecodeError, RequestException
 
+from .archive import RawArchive
 from .models import Config
 
 
@@ -13,22 +15,74 @@ class CimApi:
 
     Implements methods to fetch pipeline IDs and their corresponding details.
     Uses a requests.Session for efficiency and includes robust error handling.
+
+    Pipeline details are fetched in priority order (unseen before already
+    stored, newest first) so that a run cut short by the configured time or
+    request budget still captures the most useful data. Nothing is carried
+    over between runs: each run lists IDs from page 0 again, so pages or
+    pipelines skipped by one run are only picked up by a later run whose
+    budget reaches them.
     """
 
-    def __init__(self, config: Config, logger: logging.Logger) -> None:
+    REQUEST_TIMEOUT = 10
+    # Maximum share of the time and request budgets spent listing IDs.
+    LISTING_BUDGET_SHARE = 0.5
+
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger,
+        recorder: Optional[RawArchive] = None
+    ) -> None:
         """
         Initialize the CimApi client.
 
         Args:
             config (Config): Configuration object with API URLs and settings.
             logger (logging.Logger): Logger for status and error messages.
+            recorder (Optional[RawArchive]): Archive that every fetched raw
+            pipeline payload is also written to, if set.
         """
         self.config: Config = config
         self.logger: logging.Logger = logger
+        self.recorder: Optional[RawArchive] = recorder
         self.session: requests.Session = requests.Session()
 
         self.pipeline_ids: List[str] = []
         self.raw_results: List[Dict] = []
+        self.deferred_pipeline_ids: List[str] = []
+        self.unlisted_pages: Dict[str, int] = {}
+        # Set when the run budget cut listing or fetching short, as opposed
+        # to the budget merely being used up by the last request.
+        self.stopped_early: bool = False
+
+        self.started_at: float = time.monotonic()
+        self.requests_made: int = 0
+
+    def _remaining_time(self) -> Optional[float]:
+        """
+        Seconds left in the time budget, or None if no time budget is set.
+        """
+        if self.config.time_budget is None:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return max(self.config.time_budget - elapsed, 0.0)
+
+    def budget_exhausted(self) -> bool:
+        """
+        Check whether the configured time or request budget has run out.
+
+        Returns:
+            True if no further requests should be made in this run.
+        """
+        remaining = self._remaining_time()
+        if remaining is not None and remaining <= 0:
+            return True
+
+        return (
+            self.config.request_budget is not None
+            and self.requests_made >= self.config.request_budget
+        )
 
     def _make_request(self, url: str) -> Optional[Dict[str, Any]]:
         """
@@ -40,8 +94,14 @@ class CimApi:
         Returns:
             A dictionary with the JSON response, or None if an error occurred.
         """
+        timeout = self.REQUEST_TIMEOUT
+        remaining = self._remaining_time()
+        if remaining is not None:
+            timeout = min(timeout, max(remaining, 1.0))
+
+        self.requests_made += 1
         try:
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url, timeout=timeout)
             response.raise_for_status()
             return response.json()
 
@@ -58,9 +118,40 @@ class CimApi:
 
         return None
 
+    def _listing_budget_exhausted(self) -> bool:
+        """
+        Check whether ID listing has used up its share of the run budget.
+
+        Listing is capped at LISTING_BUDGET_SHARE of the time and request
+        budgets so that part of the budget is always left for fetching
+        pipeline details.
+
+        Returns:
+            True if no further ID pages should be listed in this run.
+        """
+        if self.budget_exhausted():
+            return True
+
+        share = self.LISTING_BUDGET_SHARE
+        if self.config.time_budget is not None:
+            elapsed = time.monotonic() - self.started_at
+            if elapsed >= share * self.config.time_budget:
+                return True
+
+        return (
+            self.config.request_budget is not None
+            and self.requests_made >= share * self.config.request_budget
+        )
+
     def get_pipeline_ids(self) -> None:
         """
         Fetch all pipeline IDs for the project IDs specified in the config.
+
+        Pages are listed round-robin across projects, so the newest page of
+        every project is listed before older pages of any project. If the
+        listing share of the run budget runs out, listing stops for all
+        projects and the first unlisted page of each project is recorded in
+        `self.unlisted_pages`.
         """
         ids: List[str] = []
         page_limit = (
@@ -69,43 +160,114 @@ class CimApi:
             else self.config.max_pages_prod
         )
 
-        for project_id in self.config.project_ids:
-            for i in range(page_limit):
+        # Projects that may have more pages, mapped to their next page.
+        next_page: Dict[str, int] = {
+            project_id: 0 for project_id in self.config.project_ids
+        }
+        self.unlisted_pages = {}
+
+        for i in range(page_limit):
+            for project_id in list(next_page):
+                if self._listing_budget_exhausted():
+                    self.unlisted_pages = dict(next_page)
+                    break
+
                 url = f"{self.config.pipelines_url}/{project_id}/{i}/ids"
                 data = self._make_request(url)
 
                 if data is None:
-                    break
+                    del next_page[project_id]
+                    continue
 
                 pipeline_ids = data.get('pipeline_ids', [])
                 if not pipeline_ids:
                     self.logger.info(
                         "End of ID groups for project %s", project_id
                     )
-                    break
+                    del next_page[project_id]
+                    continue
 
                 self.logger.info(
                     "Pipeline group %d for project %s captured", i, project_id
                 )
                 ids.extend(pipeline_ids)
+                next_page[project_id] = i + 1
+
+            if self.unlisted_pages or not next_page:
+                break
+
+        if self.unlisted_pages:
+            self.stopped_early = True
+            self.logger.warning(
+                "Listing budget exhausted after %d requests. Pages not listed "
+                "in this run (listing restarts from page 0 next run): %s",
+                self.requests_made,
+                ", ".join(
+                    f"project {project_id} pages {page}-{page_limit - 1}"
+                    for project_id, page in self.unlisted_pages.items()
+                )
+            )
 
         self.logger.info(
             "Captured a total of %d pipeline IDs.", len(ids)
         )
         self.pipeline_ids = ids
 
-    def get_pipeline_results(self) -> None:
+    @staticmethod
+    def _prioritize_pipeline_ids(
+        pipeline_ids: List[str],
+        stored_ids: Set[str]
+    ) -> List[str]:
+        """
+        Order pipeline IDs for fetching: unseen before stored, newest first.
+
+        IDs are ordered newest first by numeric value when they are all
+        numeric; otherwise the API listing order is kept, as the API returns
+        the newest pipelines first.
+
+        Args:
+            pipeline_ids (List[str]): Pipeline IDs as listed by the API.
+            stored_ids (Set[str]): IDs already persisted by the output.
+
+        Returns:
+            A de-duplicated list of pipeline IDs in fetch order.
+        """
+        ordered = list(dict.fromkeys(pipeline_ids))
+
+        if ordered and all(str(pid).isdigit() for pid in ordered):
+            ordered.sort(key=lambda pid: int(pid), reverse=True)
+
+        ordered.sort(key=lambda pid: str(pid) in stored_ids)
+        return ordered
+
+    def get_pipeline_results(
+        self,
+        stored_ids: Optional[Set[str]] = None
+    ) -> None:
         """
         Fetch and process detailed results for each pipeline ID.
+
+        Pipelines are fetched in priority order. If the run budget is
+        exhausted, fetching stops and the remaining pipeline IDs are recorded
+        in `self.deferred_pipeline_ids`. They are not saved for the next run.
+
+        Args:
+            stored_ids (Optional[Set[str]]): IDs of pipelines already
+            persisted by the output, fetched after unseen ones.
         """
         self.raw_results = []
+        self.deferred_pipeline_ids = []
+        stored_ids = stored_ids or set()
 
         LOG_INTERVAL = 100
 
+        prioritized_ids = self._prioritize_pipeline_ids(
+            self.pipeline_ids, stored_ids
+        )
         pipelines_to_fetch = (
-            self.pipeline_ids[:self.config.max_pipelines_dev]
+            prioritized_ids[:self.config.max_pipelines_dev]
             if self.config.dev
-            else self.pipeline_ids
+            else prioritized_ids
         )
 
         total_pipelines = len(pipelines_to_fetch)
@@ -114,6 +276,11 @@ class CimApi:
         )
 
         for i, pipeline_id in enumerate(pipelines_to_fetch):
+            if self.budget_exhausted():
+                self.deferred_pipeline_ids = pipelines_to_fetch[i:]
+                self.stopped_early = True
+                break
+
             self.logger.debug(
                 "Fetching details for pipeline ID: %s", pipeline_id
             )
@@ -130,8 +297,38 @@ class CimApi:
 
             if data:
                 self.raw_results.append(data)
+                if self.recorder is not None:
+                    self.recorder.append(data)
 
         self.logger.info(
             "Successfully captured details for %d pipelines.",
             len(self.raw_results)
         )
+
+        if self.deferred_pipeline_ids:
+            self._log_deferred(stored_ids)
+
+    def _log_deferred(self, stored_ids: Set[str]) -> None:
+        """
+        Log the pipelines left unfetched because the run budget ran out.
+
+        Args:
+            stored_ids (Set[str]): IDs already persisted by the output.
+        """
+        deferred_unseen = [
+            pid for pid in self.deferred_pipeline_ids
+            if str(pid) not in stored_ids
+        ]
+        self.logger.warning(
+            "Run budget exhausted after %d requests in %.1fs. Left %d "
+            "listed pipelines unfetched (%d unseen, %d already stored).",
+            self.requests_made,
+            time.monotonic() - self.started_at,
+            len(self.deferred_pipeline_ids),
+            len(deferred_unseen),
+            len(self.deferred_pipeline_ids) - len(deferred_unseen)
+        )
+        self.logger.debug(
+            "Unfetched pipeline IDs: %s",
+            ", ".join(str(pid) for pid in self.deferred_pipeline_ids)
+        )
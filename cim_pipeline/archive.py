@@ -0,0 +1,275 @@
+import gzip
+import json
+import logging
+import os
+import re
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+
+class RawArchive:
+    """
+    Append-only archive of raw pipeline payloads from the CIM API.
+
+    Payloads are stored as gzip-compressed NDJSON chunk files alongside an
+    NDJSON index that maps each pipeline ID to its chunk and line. Every
+    flush writes a new chunk, so existing chunks are never rewritten. When a
+    pipeline is recorded more than once, replay returns its latest payload,
+    falling back to an earlier copy if the latest chunk is unreadable.
+
+    Layout of the archive directory:
+        chunk-00000.ndjson.gz
+        chunk-00001.ndjson.gz
+        ...
+        index.ndjson
+    """
+
+    INDEX_FILE = "index.ndjson"
+    CHUNK_PATTERN = re.compile(r"^chunk-(\d+)\.ndjson\.gz$")
+
+    def __init__(
+        self,
+        path: str,
+        logger: logging.Logger,
+        chunk_size: int = 500
+    ) -> None:
+        """
+        Initializes the archive.
+
+        Args:
+            path (str): Directory holding the archive chunks and index.
+            logger (logging.Logger): Logger for status and error messages.
+            chunk_size (int): Number of payloads buffered per chunk file.
+        """
+        self.path = path
+        self.logger = logger
+        self.chunk_size = chunk_size
+        self.index_path = os.path.join(path, self.INDEX_FILE)
+
+        self._buffer: List[Dict[str, Any]] = []
+        self.records_written: int = 0
+
+    def __enter__(self) -> "RawArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def _chunk_name(chunk_number: int) -> str:
+        return f"chunk-{chunk_number:05d}.ndjson.gz"
+
+    def _next_chunk_number(self) -> int:
+        """Return the number of the next chunk file to be written."""
+        numbers = [
+            int(match.group(1))
+            for match in map(self.CHUNK_PATTERN.match, os.listdir(self.path))
+            if match
+        ]
+        return max(numbers, default=-1) + 1
+
+    def append(self, payload: Dict[str, Any]) -> None:
+        """
+        Add a raw pipeline payload to the archive.
+
+        Payloads are buffered and written out once a full chunk is collected.
+
+        Args:
+            payload (Dict[str, Any]): A raw pipeline payload from the API.
+        """
+        self._buffer.append(payload)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered payloads to a new chunk and append them to the index.
+        """
+        if not self._buffer:
+            return
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            chunk_name = self._chunk_name(self._next_chunk_number())
+            chunk_path = os.path.join(self.path, chunk_name)
+
+            # Write to a temporary file first so a partial chunk is never
+            # referenced by the index.
+            tmp_path = f"{chunk_path}.tmp"
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                for payload in self._buffer:
+                    f.write(json.dumps(payload) + "\n")
+            os.replace(tmp_path, chunk_path)
+
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                for line, payload in enumerate(self._buffer):
+                    entry = {
+                        "id": payload.get('id'),
+                        "chunk": chunk_name,
+                        "line": line
+                    }
+                    f.write(json.dumps(entry) + "\n")
+
+            self.records_written += len(self._buffer)
+            self.logger.debug(
+                f"Archived {len(self._buffer)} raw payloads to {chunk_path}"
+            )
+        except (IOError, OSError) as e:
+            self.logger.error(
+                f"Failed to write raw payloads to archive at {self.path}: {e}"
+            )
+        finally:
+            self._buffer = []
+
+    def close(self) -> None:
+        """Flush any remaining buffered payloads."""
+        self.flush()
+        if self.records_written:
+            self.logger.info(
+                f"Recorded {self.records_written} raw payloads to archive "
+                f"{self.path}"
+            )
+
+    def _read_index(self) -> Dict[Any, List[Tuple[str, int]]]:
+        """
+        Read the index and collect every archived location of each pipeline.
+
+        Returns:
+            A mapping of pipeline ID to its locations as (chunk, line)
+            pairs, oldest first. Payloads without an ID are keyed by their
+            location so that each is replayed once.
+        """
+        locations: Dict[Any, List[Tuple[str, int]]] = {}
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                    location = (entry["chunk"], int(entry["line"]))
+                except (ValueError, KeyError, TypeError) as e:
+                    self.logger.warning(
+                        f"Skipping malformed archive index line "
+                        f"{line_number}: {e}"
+                    )
+                    continue
+
+                key = location if entry.get("id") is None else str(entry["id"])
+                locations.setdefault(key, []).append(location)
+
+        return locations
+
+    def _read_chunk(
+        self,
+        chunk_name: str,
+        lines: Set[int]
+    ) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Read the selected lines of one chunk file.
+
+        Args:
+            chunk_name (str): Name of the chunk file in the archive.
+            lines (Set[int]): Line numbers of the payloads to return.
+
+        Returns:
+            The selected payloads keyed by line number, or None if the chunk
+            is missing, truncated or corrupt.
+        """
+        chunk_path = os.path.join(self.path, chunk_name)
+        try:
+            with gzip.open(chunk_path, 'rt', encoding='utf-8') as f:
+                return {
+                    line_number: json.loads(line)
+                    for line_number, line in enumerate(f)
+                    if line_number in lines
+                }
+        # gzip.BadGzipFile is an OSError; a truncated chunk raises EOFError.
+        except (EOFError, OSError, zlib.error, ValueError) as e:
+            self.logger.error(
+                f"Unreadable archive chunk {chunk_name}: {e}"
+            )
+            return None
+
+    def iter_payloads(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the latest readable archived payload for each pipeline.
+
+        If the chunk holding a pipeline's latest payload cannot be read, the
+        previous copy from an earlier chunk is used instead. Pipelines with
+        no readable copy are logged by ID and skipped.
+
+        Yields:
+            Raw pipeline payloads.
+        """
+        pending = self._read_index()
+        bad_locations: Set[Tuple[str, int]] = set()
+        failed_chunks: Set[str] = set()
+        lost: List[str] = []
+
+        while pending:
+            # Pick the newest location of each pending pipeline that has not
+            # already failed, grouped by chunk.
+            selected: Dict[str, Dict[int, Any]] = {}
+            for key, locations in list(pending.items()):
+                readable = [
+                    location for location in locations
+                    if location not in bad_locations
+                    and location[0] not in failed_chunks
+                ]
+                if not readable:
+                    lost.append(str(key))
+                    del pending[key]
+                    continue
+                chunk_name, line = readable[-1]
+                selected.setdefault(chunk_name, {})[line] = key
+
+            for chunk_name in sorted(selected):
+                keys_by_line = selected[chunk_name]
+                payloads = self._read_chunk(chunk_name, set(keys_by_line))
+
+                for line, key in keys_by_line.items():
+                    if payloads is not None and line in payloads:
+                        del pending[key]
+                        yield payloads[line]
+                    else:
+                        bad_locations.add((chunk_name, line))
+
+                if payloads is None:
+                    failed_chunks.add(chunk_name)
+                    affected = ", ".join(str(k) for k in keys_by_line.values())
+                    self.logger.warning(
+                        f"Falling back to earlier copies, where archived, "
+                        f"for pipelines in {chunk_name}: {affected}"
+                    )
+
+        if lost:
+            self.logger.error(
+                f"No readable copy in archive {self.path} for {len(lost)} "
+                f"pipelines; not replayed: {', '.join(lost)}"
+            )
+
+    def load(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load all archived payloads for replay.
+
+        Returns:
+            A list of raw pipeline payloads, or None if the archive could not
+            be read.
+        """
+        if not os.path.exists(self.index_path):
+            self.logger.error(
+                f"No archive index found at {self.index_path}."
+            )
+            return None
+
+        try:
+            payloads = list(self.iter_payloads())
+        except (IOError, OSError, ValueError) as e:
+            self.logger.error(
+                f"Failed to read raw payload archive at {self.path}: {e}"
+            )
+            return None
+
+        self.logger.info(
+            f"Loaded {len(payloads)} raw payloads from archive {self.path}"
+        )
+        return payloads
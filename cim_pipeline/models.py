@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 
 @dataclass()
@@ -18,6 +18,10 @@ class Config:
     output_type: str
     dev: bool
     output_file: Optional[str]
+    # Output path for every configured sink, keyed by output type. When
+    # fanning out to several sinks (e.g. `--output json,sqlite`), output_type
+    # is "composite" and output_file is None.
+    output_files: Dict[str, str] = field(default_factory=dict)
 
     # Dev/Prod limits
     max_pages_dev: int = 4
@@ -25,6 +29,16 @@ class Config:
     max_pipelines_dev: int = 5
     platform: str = "3110"
 
+    # Optional run budgets; the API scheduler stops cleanly once either is
+    # exhausted, leaving the remaining pipelines unfetched for this run.
+    time_budget: Optional[float] = None
+    request_budget: Optional[int] = None
+
+    # Raw payload archive: record API responses to, or replay them from, a
+    # local archive directory instead of the network.
+    record_path: Optional[str] = None
+    replay_path: Optional[str] = None
+
 
 @dataclass(frozen=True)
 class ResultRecord:
@@ -1,8 +1,9 @@
 import logging
 import sys
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from .api import CimApi
+from .archive import RawArchive
 from .models import Config, ResultRecord
 from .outputs import OutputBase
 from .processing import ResultProcessor
@@ -41,16 +42,76 @@ class CimOrchestrator:
         """
         Executes the data extraction (API) part of the workflow.
 
+        If a record path is configured, every fetched raw payload is also
+        written to the archive at that path.
+
         Returns:
             A list of raw pipeline result dictionaries.
         """
+        if self.config.replay_path:
+            return self._replay_workflow()
+
         self.logger.info("Starting API workflow: Fetching pipeline data...")
-        api = CimApi(self.config, self.logger)
-        api.get_pipeline_ids()
-        api.get_pipeline_results()
+        if self.config.record_path:
+            with RawArchive(self.config.record_path, self.logger) as recorder:
+                api = self._fetch_from_api(recorder)
+        else:
+            api = self._fetch_from_api()
+
+        if api.stopped_early:
+            self.logger.info(
+                "Run budget reached; flushing %d fetched results through "
+                "processing and output.", len(api.raw_results)
+            )
         self.logger.info("API workflow completed.")
         return api.raw_results
 
+    def _fetch_from_api(
+        self,
+        recorder: Optional[RawArchive] = None
+    ) -> CimApi:
+        """
+        Fetches pipeline IDs and details from the CIM API.
+
+        Args:
+            recorder (Optional[RawArchive]): Archive to record raw payloads
+            to, if any.
+
+        Returns:
+            The CimApi client holding the fetched raw results.
+        """
+        api = CimApi(self.config, self.logger, recorder)
+        api.get_pipeline_ids()
+        api.get_pipeline_results(self.output_handler.get_stored_pipeline_ids())
+        return api
+
+    def _replay_workflow(self) -> List[Dict]:
+        """
+        Loads raw pipeline results from a recorded archive instead of the API.
+
+        Exits with a non-zero status if the archive is missing or unreadable,
+        so a wrong --replay path is not mistaken for an empty archive.
+
+        Returns:
+            A list of raw pipeline result dictionaries.
+        """
+        self.logger.info(
+            "Starting replay workflow: Reading archive "
+            f"{self.config.replay_path}..."
+        )
+        archive = RawArchive(self.config.replay_path, self.logger)
+        raw_results = archive.load()
+
+        if raw_results is None:
+            self.logger.critical(
+                f"Could not read replay archive at {self.config.replay_path}. "
+                "Halting workflow."
+            )
+            sys.exit(1)
+
+        self.logger.info("Replay workflow completed.")
+        return raw_results
+
     def _processing_workflow(
         self,
         raw_results: List[Dict]
@@ -70,16 +131,26 @@ class CimOrchestrator:
         self.logger.info("Processing workflow completed.")
         return processor.processed_records
 
-    def _output_workflow(self, processed_records: List[ResultRecord]) -> None:
+    def _output_workflow(self, processed_records: List[ResultRecord]) -> bool:
         """
         Executes the data loading (output) part of the workflow.
 
+        When replaying an archive, stored records for the replayed pipelines
+        are replaced so reprocessed results supersede the old ones.
+
         Args:
             processed_records: A list of processed records to be written.
+
+        Returns:
+            True if the output handler wrote the records successfully.
         """
         self.logger.info("Starting output workflow: Writing records...")
-        self.output_handler.write(processed_records)
+        replace = bool(self.config.replay_path)
+        if not self.output_handler.write(processed_records, replace):
+            self.logger.error("Output workflow completed with errors.")
+            return False
         self.logger.info("Output workflow completed.")
+        return True
 
     def run(self):
         """
@@ -93,8 +164,10 @@ class CimOrchestrator:
             raw_results = self._api_workflow()
 
             if not raw_results:
+                source = "archive" if self.config.replay_path else "API"
                 self.logger.info(
-                    "No raw results returned from API. Halting workflow."
+                    f"No raw results returned from {source}. "
+                    "Halting workflow."
                 )
                 return
 
@@ -107,7 +180,11 @@ class CimOrchestrator:
                 )
                 return
 
-            self._output_workflow(processed_records)
+            if not self._output_workflow(processed_records):
+                self.logger.error(
+                    "CIM Orchestrator run finished with output errors."
+                )
+                return
 
             self.logger.info("CIM Orchestrator run finished successfully.")
 
@@ -1,9 +1,11 @@
 import abc
 import json
 import logging
+import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
-from typing import List
+from typing import Dict, List, Optional, Set
 
 from .models import Config, ResultRecord
 
@@ -15,40 +17,79 @@ class OutputBase(abc.ABC):
     Subclasses must implement the write() method to persist results.
     """
 
-    def __init__(self, config: Config, logger: logging.Logger):
+    # Whether records written by one run are still there on the next run.
+    # Handlers that rewrite their destination every run leave this False.
+    persists_between_runs: bool = False
+
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger,
+        output_path: Optional[str] = None
+    ):
         """
         Initializes the output handler.
 
         Args:
             config (Config): The application configuration object.
             logger (logging.Logger): The logger for status and error messages.
+            output_path (Optional[str]): Destination path for this handler.
+            Defaults to the output file from the config.
         """
         self.config = config
         self.logger = logger
-        self.output_path = config.output_file
+        self.output_path = output_path or config.output_file
 
     @abc.abstractmethod
-    def write(self, results: List[ResultRecord]) -> None:
+    def write(
+        self,
+        results: List[ResultRecord],
+        replace: bool = False
+    ) -> bool:
         """
         Persist result records to the output destination.
 
         Args:
             results (List[ResultRecord]): A list of result records to write.
+            replace (bool): If True, records already stored for the pipelines
+            in `results` are replaced rather than kept. Other pipelines are
+            left untouched.
+
+        Returns:
+            True if the records were written, False if the write failed.
+            Handlers log their own failures before returning False.
         """
         raise NotImplementedError
 
+    def get_stored_pipeline_ids(self) -> Set[str]:
+        """
+        Return the IDs of pipelines already persisted by this handler.
+
+        Used by the API scheduler to fetch unseen pipelines first. Handlers
+        that do not persist between runs return an empty set.
+
+        Returns:
+            A set of pipeline IDs as strings.
+        """
+        return set()
+
 
 class JsonOutput(OutputBase):
     """
     Output handler for writing results to a JSON file.
     """
 
-    def write(self, results: List[ResultRecord]) -> None:
+    def write(
+        self,
+        results: List[ResultRecord],
+        replace: bool = False
+    ) -> bool:
+        # The JSON file is rewritten on every write, so `replace` is implied.
         if not self.output_path:
             self.logger.error(
                 "JSON output requested but no output file path was provided."
             )
-            return
+            return False
 
         if results and is_dataclass(results[0]):
             output_data = [asdict(record) for record in results]
@@ -62,10 +103,12 @@ class JsonOutput(OutputBase):
                 f"Successfully wrote {len(results)} records to "
                 f"{self.output_path}"
             )
+            return True
         except IOError as e:
             self.logger.error(
                 f"Failed to write to JSON file at {self.output_path}: {e}"
             )
+            return False
 
 
 class SqliteOutput(OutputBase):
@@ -76,6 +119,10 @@ class SqliteOutput(OutputBase):
     resources are properly handled.
     """
 
+    persists_between_runs = True
+
+    UNIQUE_INDEX = "results_unique_stage"
+
     def _create_table(self, conn: sqlite3.Connection):
         """Creates the results table if it doesn't already exist."""
         cursor = conn.cursor()
@@ -90,20 +137,84 @@ class SqliteOutput(OutputBase):
                 platform TEXT
             )
         ''')
+
+        # A stage result is identified by its pipeline, test case and end
+        # time, so INSERT OR IGNORE skips records that are already stored.
+        has_unique_index = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (self.UNIQUE_INDEX,)
+        ).fetchone()
+        if not has_unique_index:
+            # Databases created before the index existed may hold duplicate
+            # rows; keep the oldest copy of each so the index can be built.
+            cursor.execute('''
+                DELETE FROM results
+                WHERE id NOT IN (
+                    SELECT MIN(id) FROM results
+                    GROUP BY cim_url, test_case, timestamp
+                )
+            ''')
+            if cursor.rowcount > 0:
+                self.logger.info(
+                    f"Removed {cursor.rowcount} duplicate records from "
+                    f"{self.output_path}"
+                )
+            cursor.execute(f'''
+                CREATE UNIQUE INDEX {self.UNIQUE_INDEX}
+                ON results (cim_url, test_case, timestamp)
+            ''')
         conn.commit()
 
-    def write(self, results: List[ResultRecord]) -> None:
+    def get_stored_pipeline_ids(self) -> Set[str]:
+        if not self.output_path or not os.path.exists(self.output_path):
+            return set()
+
+        try:
+            with sqlite3.connect(self.output_path) as conn:
+                self._create_table(conn)
+                rows = conn.execute(
+                    "SELECT DISTINCT cim_url FROM results"
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(
+                f"Could not read stored pipeline IDs from "
+                f"{self.output_path}: {e}"
+            )
+            return set()
+
+        return {
+            cim_url.rstrip("/").rsplit("/", 1)[-1]
+            for (cim_url,) in rows
+            if cim_url
+        }
+
+    def write(
+        self,
+        results: List[ResultRecord],
+        replace: bool = False
+    ) -> bool:
         if not self.output_path:
             self.logger.error(
                 "SQLite output requested but no database path was provided."
             )
-            return
+            return False
 
         try:
             with sqlite3.connect(self.output_path) as conn:
                 self._create_table(conn)
 
                 cursor = conn.cursor()
+                if replace:
+                    cim_urls = sorted({r.cim_url for r in results})
+                    cursor.executemany(
+                        "DELETE FROM results WHERE cim_url = ?",
+                        [(cim_url,) for cim_url in cim_urls]
+                    )
+                    self.logger.info(
+                        f"Replacing stored records for {len(cim_urls)} "
+                        f"pipelines in {self.output_path}"
+                    )
+
                 data_to_insert = [
                     (
                         r.test_case,
@@ -131,9 +242,92 @@ class SqliteOutput(OutputBase):
                 self.logger.info(
                     f"Wrote {rowcount} new records to {self.output_path}"
                 )
+            return True
 
         except sqlite3.Error as e:
             self.logger.error(
                 f"An error occurred with the SQLite database at "
                 f"{self.output_path}: {e}"
             )
+            return False
+
+
+class CompositeOutput(OutputBase):
+    """
+    Output handler that fans a single batch of results out to several sinks.
+
+    Each sink is written from its own worker thread, so a slow sink does not
+    hold up the others. A failure in one sink is logged against that sink and
+    does not prevent the remaining sinks from completing.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger,
+        handlers: Dict[str, OutputBase]
+    ):
+        """
+        Initializes the composite output handler.
+
+        Args:
+            config (Config): The application configuration object.
+            logger (logging.Logger): The logger for status and error messages.
+            handlers (Dict[str, OutputBase]): The sinks to write to, keyed by
+            output type.
+        """
+        super().__init__(config, logger)
+        self.handlers = handlers
+
+    def get_stored_pipeline_ids(self) -> Set[str]:
+        # A pipeline only counts as stored if every sink that persists
+        # between runs already has it; sinks rewritten each run are ignored.
+        stored_ids = [
+            handler.get_stored_pipeline_ids()
+            for handler in self.handlers.values()
+            if handler.persists_between_runs
+        ]
+        return set.intersection(*stored_ids) if stored_ids else set()
+
+    def write(
+        self,
+        results: List[ResultRecord],
+        replace: bool = False
+    ) -> bool:
+        if not self.handlers:
+            self.logger.error("Composite output has no sinks configured.")
+            return False
+
+        with ThreadPoolExecutor(max_workers=len(self.handlers)) as executor:
+            futures = {
+                name: executor.submit(handler.write, results, replace)
+                for name, handler in self.handlers.items()
+            }
+
+        failed = []
+        for name, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                failed.append(name)
+                self.logger.error(
+                    f"Output sink '{name}' raised while writing "
+                    f"{len(results)} records: {error}",
+                    exc_info=error
+                )
+            elif not future.result():
+                failed.append(name)
+                self.logger.error(
+                    f"Output sink '{name}' failed to write {len(results)} "
+                    f"records."
+                )
+
+        summary = (
+            f"Fan-out complete: {len(self.handlers) - len(failed)} of "
+            f"{len(self.handlers)} sinks succeeded."
+        )
+        if failed:
+            self.logger.error(f"{summary} Failed sinks: {', '.join(failed)}")
+            return False
+
+        self.logger.info(summary)
+        return True
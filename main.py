@@ -1,12 +1,29 @@
 import argparse
 import logging
+import os
 import sys
+from typing import Dict, List
 
 from dotenv import dotenv_values
 
 from cim_pipeline.models import Config
 from cim_pipeline.orchestrator import CimOrchestrator
-from cim_pipeline.outputs import JsonOutput, SqliteOutput, OutputBase
+from cim_pipeline.outputs import (
+    CompositeOutput,
+    JsonOutput,
+    OutputBase,
+    SqliteOutput,
+)
+
+OUTPUT_TYPES = {
+    "json": JsonOutput,
+    "sqlite": SqliteOutput,
+}
+
+DEFAULT_OUTPUT_FILES = {
+    "json": "automation_results.json",
+    "sqlite": "automation_results.db",
+}
 
 
 def setup_logging() -> logging.Logger:
@@ -36,6 +53,29 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+def parse_output_types(value: str) -> List[str]:
+    """
+    Parses a comma-separated list of output types for the --output argument.
+    """
+    output_types = [item.strip() for item in value.split(",") if item.strip()]
+    if not output_types:
+        raise argparse.ArgumentTypeError(
+            "At least one output type is required."
+        )
+
+    invalid = [item for item in output_types if item not in OUTPUT_TYPES]
+    if invalid:
+        raise argparse.ArgumentTypeError(
+            f"Invalid output type(s): {', '.join(invalid)}. "
+            f"Choose from: {', '.join(OUTPUT_TYPES)}."
+        )
+    if len(set(output_types)) != len(output_types):
+        raise argparse.ArgumentTypeError(
+            f"Duplicate output type in: {value}"
+        )
+    return output_types
+
+
 def setup_argparse() -> argparse.Namespace:
     """Configures and parses command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -45,9 +85,13 @@ def setup_argparse() -> argparse.Namespace:
     )
     parser.add_argument(
         "--output",
-        choices=["json", "sqlite"],
-        default="json",
-        help="Output format. Default: json.",
+        type=parse_output_types,
+        default=["json"],
+        help="""
+        Output format, or a comma-separated list of formats to write to from a
+        single fetch (e.g. 'json,sqlite'). Choices: json, sqlite.
+        Default: json.
+        """,
     )
     parser.add_argument(
         "--prod",
@@ -60,7 +104,42 @@ def setup_argparse() -> argparse.Namespace:
         "--output-file",
         help="""
         Output file path. Defaults to 'automation_results.json' or
-        'automation_results.db'.
+        'automation_results.db'. When several outputs are given, pass a
+        comma-separated list of paths in the same order.
+        """,
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="""
+        Maximum run time in seconds for fetching from the CIM API. When it is
+        reached, the run stops cleanly, writes what was fetched and defers the
+        rest to the next run.
+        """,
+    )
+    parser.add_argument(
+        "--request-budget",
+        type=int,
+        help="""
+        Maximum number of CIM API requests for the run. Behaves like
+        --time-budget once exhausted.
+        """,
+    )
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument(
+        "--record",
+        metavar="ARCHIVE_DIR",
+        help="""
+        Also write every raw pipeline payload fetched from the API to a
+        compressed, append-only archive in this directory.
+        """,
+    )
+    archive_group.add_argument(
+        "--replay",
+        metavar="ARCHIVE_DIR",
+        help="""
+        Process and output the payloads recorded in this archive directory
+        instead of fetching from the API. No network requests are made.
         """,
     )
     return parser.parse_args()
@@ -88,14 +167,38 @@ def create_config(args: argparse.Namespace) -> Config:
             f"Missing required environment variable in .env file: {e}"
         ) from e
 
-    output_file = (
-        args.output_file
-        or (
-            "automation_results.json"
-            if args.output == "json"
-            else "automation_results.db"
+    if args.output_file and len(args.output) == 1:
+        output_paths = [args.output_file]
+    elif args.output_file:
+        output_paths = [path.strip() for path in args.output_file.split(",")]
+        if len(output_paths) != len(args.output):
+            raise ValueError(
+                f"Expected {len(args.output)} output file paths for outputs "
+                f"{','.join(args.output)}, got {len(output_paths)}."
+            )
+        resolved_paths = [os.path.abspath(path) for path in output_paths]
+        if len(set(resolved_paths)) != len(resolved_paths):
+            raise ValueError(
+                f"Duplicate output file path in: {args.output_file}"
+            )
+    else:
+        output_paths = [
+            DEFAULT_OUTPUT_FILES[output_type] for output_type in args.output
+        ]
+
+    output_files = dict(zip(args.output, output_paths))
+
+    if args.time_budget is not None and args.time_budget <= 0:
+        raise ValueError("--time-budget must be a positive number of seconds.")
+    if args.request_budget is not None and args.request_budget <= 0:
+        raise ValueError("--request-budget must be a positive integer.")
+    budgeted = args.time_budget is not None or args.request_budget is not None
+    if budgeted and "json" in args.output:
+        raise ValueError(
+            "--time-budget and --request-budget cannot be used with json "
+            "output: the JSON file is rewritten on every run, so a run cut "
+            "short would replace it with partial results."
         )
-    )
 
     return Config(
         project_ids=project_ids,
@@ -103,23 +206,39 @@ def create_config(args: argparse.Namespace) -> Config:
         one_pipeline_url=env["ONE_PIPELINE_URL"],
         cim_base_url=env.get("CIM_BASE_URL", ""),
         dev=not args.prod,
-        output_type=args.output,
-        output_file=output_file
+        output_type=args.output[0] if len(args.output) == 1 else "composite",
+        output_file=output_paths[0] if len(output_paths) == 1 else None,
+        output_files=output_files,
+        time_budget=args.time_budget,
+        request_budget=args.request_budget,
+        record_path=args.record,
+        replay_path=args.replay
     )
 
 
 def create_output_handler(
     config: Config, logger: logging.Logger
 ) -> OutputBase:
-    """Factory function to create the appropriate output handler."""
-    if config.output_type == "json":
-        return JsonOutput(config, logger)
-    if config.output_type == "sqlite":
-        return SqliteOutput(config, logger)
-
-    raise ValueError(
-        f"Unsupported output type specified: {config.output_type}"
-    )
+    """
+    Factory function to create the appropriate output handler.
+
+    Returns a single handler for one output type, or a CompositeOutput that
+    fans out to every requested sink when several types are configured.
+    """
+    handlers: Dict[str, OutputBase] = {}
+    for output_type, output_path in config.output_files.items():
+        handler_class = OUTPUT_TYPES.get(output_type)
+        if handler_class is None:
+            raise ValueError(
+                f"Unsupported output type specified: {output_type}"
+            )
+        handlers[output_type] = handler_class(config, logger, output_path)
+
+    if not handlers:
+        raise ValueError("No output type specified.")
+    if len(handlers) == 1:
+        return next(iter(handlers.values()))
+    return CompositeOutput(config, logger, handlers)
 
 
 def main():
@@ -133,10 +252,18 @@ def main():
             f"Starting application in "
             f"{'PROD' if not config.dev else 'DEV'} mode."
         )
-        logger.info(
-            f"Output target: {config.output_type} -> "
-            f"'{config.output_file}'"
-        )
+        for output_type, output_path in config.output_files.items():
+            logger.info(f"Output target: {output_type} -> '{output_path}'")
+        if config.time_budget or config.request_budget:
+            logger.info(
+                f"Run budget: time={config.time_budget or 'unlimited'}s, "
+                f"requests={config.request_budget or 'unlimited'}"
+            )
+
+        if config.record_path:
+            logger.info(f"Recording raw payloads to '{config.record_path}'")
+        if config.replay_path:
+            logger.info(f"Replaying raw payloads from '{config.replay_path}'")
 
         output_handler = create_output_handler(config, logger)
 